@@ -1,2 +1,11 @@
 from . import models
-from . import controllers
\ No newline at end of file
+from . import controllers
+
+
+def uninstall_hook(env):
+    """Supprime les objets SQL créés hors ORM par dashboard.projet"""
+    # Index posés par init() sur des tables du module account / analytic
+    for index in ('dashboard_projet_am_facture_date_idx',
+                  'dashboard_projet_aml_compte_date_idx',
+                  'dashboard_projet_aal_projet_date_idx'):
+        env.cr.execute(f"DROP INDEX IF EXISTS {index}")
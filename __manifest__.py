@@ -43,6 +43,7 @@
             "dashboard_projet/static/src/xml/dashboard_chart.xml",
         ],
     },
+    "uninstall_hook": "uninstall_hook",
     "installable": True,
     "application": True,
     "auto_install": False,
@@ -53,7 +53,7 @@ class DashboardController(http.Controller):
     def export_complete_dashboard(self, date_debut=None, date_fin=None, **kwargs):
         """Endpoint pour l'export complet avec graphiques"""
         try:
-            _logger.info(f"Export complet dashboard demandé - dates: {date_debut} - {date_fin}")
+            _logger.info("Export complet dashboard demandé - dates: %s - %s", date_debut, date_fin)
             
             if not request.env.user:
                 return request.make_response("Utilisateur non authentifié", status=401)
@@ -82,7 +82,7 @@ class DashboardController(http.Controller):
             )
             
         except Exception as e:
-            _logger.error(f"Erreur export complet dashboard: {str(e)}")
+            _logger.error("Erreur export complet dashboard: %s", e)
             return request.make_response(f"Erreur export: {str(e)}", status=500)
 
     def _generate_complete_pdf(self, data, date_debut, date_fin):
@@ -222,7 +222,7 @@ class DashboardController(http.Controller):
             return buffer
             
         except Exception as e:
-            _logger.error(f"Erreur génération PDF complet: {str(e)}")
+            _logger.error("Erreur génération PDF complet: %s", e)
             raise e
 
 
@@ -267,7 +267,7 @@ class DashboardController(http.Controller):
     def get_dashboard_data(self, date_debut=None, date_fin=None):
         """Endpoint principal pour récupérer les données du dashboard"""
         try:
-            _logger.info(f"Requête dashboard - début: {date_debut}, fin: {date_fin}")
+            _logger.info("Requête dashboard - début: %s, fin: %s", date_debut, date_fin)
             
             # Vérification de l'authentification
             if not request.env.user:
@@ -289,32 +289,32 @@ class DashboardController(http.Controller):
             # Validation du résultat
             result = self._ensure_valid_response(result)
             
-            _logger.info(f"Données dashboard retournées avec succès - {len(result.get('projets', []))} projets")
+            _logger.info("Données dashboard retournées avec succès - %s projets", len(result.get('projets', [])))
             return result
             
         except AccessError as e:
-            _logger.error(f"Erreur d'accès: {str(e)}")
+            _logger.error("Erreur d'accès: %s", e)
             return self._error_response('Accès refusé', include_default=True)
             
         except ValidationError as e:
-            _logger.error(f"Erreur de validation: {str(e)}")
+            _logger.error("Erreur de validation: %s", e)
             return self._error_response(f'Erreur de validation: {str(e)}', include_default=True)
             
         except Exception as e:
-            _logger.error(f"Erreur inattendue: {str(e)}")
+            _logger.error("Erreur inattendue: %s", e)
             return self._error_response(f'Erreur serveur: {str(e)}', include_default=True)
     
     @http.route('/dashboard_projet/projet_marge/<int:projet_id>', type='json', auth='user', methods=['POST'], csrf=False)
     def get_projet_marge(self, projet_id, date_debut=None, date_fin=None):
         """Endpoint pour récupérer la marge d'un projet spécifique"""
         try:
-            _logger.info(f"Calcul marge demandé - projet: {projet_id}, début: {date_debut}, fin: {date_fin}")
+            _logger.info("Calcul marge demandé - projet: %s, début: %s, fin: %s", projet_id, date_debut, date_fin)
             
             if not request.env.user:
                 return self._error_response('Utilisateur non authentifié', default_marge=True)
             
             if not projet_id or projet_id <= 0:
-                _logger.warning(f"ID projet invalide: {projet_id}")
+                _logger.warning("ID projet invalide: %s", projet_id)
                 return self._default_marge_data()
             
             if 'dashboard.projet' not in request.env:
@@ -329,7 +329,7 @@ class DashboardController(http.Controller):
             if 'project.project' in request.env:
                 projet = request.env['project.project'].browse(projet_id)
                 if not projet.exists():
-                    _logger.warning(f"Projet {projet_id} non trouvé")
+                    _logger.warning("Projet %s non trouvé", projet_id)
                     return self._error_response('Projet non trouvé', default_marge=True)
             
             dashboard_model = request.env['dashboard.projet']
@@ -338,23 +338,57 @@ class DashboardController(http.Controller):
             # Validation et conversion du résultat
             result = self._ensure_valid_marge(result)
             
-            _logger.info(f"Marge calculée pour projet {projet_id}: {result}")
+            _logger.info("Marge calculée pour projet %s: %s", projet_id, result)
             return result
             
         except AccessError as e:
-            _logger.error(f"Erreur d'accès marge projet: {str(e)}")
+            _logger.error("Erreur d'accès marge projet: %s", e)
             return self._error_response('Accès refusé', default_marge=True)
             
         except Exception as e:
-            _logger.error(f"Erreur marge projet {projet_id}: {str(e)}")
+            _logger.error("Erreur marge projet %s: %s", projet_id, e)
             return self._error_response(f'Erreur serveur: {str(e)}', default_marge=True)
 
+    @http.route('/dashboard_projet/batch_marges', type='json', auth='user', methods=['POST'], csrf=False)
+    def get_batch_marges(self, projet_ids=None, date_debut=None, date_fin=None):
+        """Endpoint pour récupérer les marges de plusieurs projets en un appel"""
+        try:
+            if not request.env.user:
+                return {'error': 'Utilisateur non authentifié', 'marges': {}}
+            
+            if not isinstance(projet_ids, list):
+                return {'marges': {}}
+            projet_ids = [projet_id for projet_id in projet_ids if isinstance(projet_id, int) and projet_id > 0]
+            
+            if not projet_ids or 'dashboard.projet' not in request.env:
+                return {'marges': {}}
+            
+            # Validation des dates
+            date_debut = self._validate_date(date_debut)
+            date_fin = self._validate_date(date_fin)
+            
+            marges = request.env['dashboard.projet'].get_marges_projets(projet_ids, date_debut, date_fin)
+            return {
+                'marges': {
+                    projet_id: self._ensure_valid_marge(marge)
+                    for projet_id, marge in marges.items()
+                }
+            }
+            
+        except AccessError as e:
+            _logger.error("Erreur d'accès marges projets: %s", e)
+            return {'error': 'Accès refusé', 'marges': {}}
+            
+        except Exception as e:
+            _logger.error("Erreur marges projets: %s", e)
+            return {'error': f'Erreur serveur: {str(e)}', 'marges': {}}
+
     # ===== EXPORT UNIFIÉ (CORRIGÉ) =====
     @http.route('/dashboard_projet/export', type='http', auth='user', methods=['GET'], csrf=False)
     def export_dashboard(self, date_debut=None, date_fin=None, format='xlsx', **kwargs):
         """Endpoint unifié pour l'export du dashboard"""
         try:
-            _logger.info(f"Export dashboard demandé - format: {format}, dates: {date_debut} - {date_fin}")
+            _logger.info("Export dashboard demandé - format: %s, dates: %s - %s", format, date_debut, date_fin)
             
             if not request.env.user:
                 return request.make_response("Utilisateur non authentifié", status=401)
@@ -370,21 +404,20 @@ class DashboardController(http.Controller):
             dashboard_model = request.env['dashboard.projet']
             data = dashboard_model.get_dashboard_data(date_debut, date_fin)
             
-            # Récupération des marges pour chaque projet
+            # Récupération des marges de tous les projets en un seul calcul groupé
+            try:
+                marges = dashboard_model.get_marges_projets(
+                    [projet["id"] for projet in data.get("projets", [])], date_debut, date_fin
+                )
+            except Exception as e:
+                _logger.warning("Erreur calcul marges projets: %s", e)
+                marges = {}
+            
             projets_with_margins = []
             for projet in data.get("projets", []):
-                try:
-                    marge_data = dashboard_model.get_marge_salariale_projet(
-                        projet["id"], date_debut, date_fin
-                    )
-                    projet_copy = dict(projet)
-                    projet_copy["marge_data"] = self._ensure_valid_marge(marge_data)
-                    projets_with_margins.append(projet_copy)
-                except Exception as e:
-                    _logger.warning(f"Erreur calcul marge projet {projet['id']}: {str(e)}")
-                    projet_copy = dict(projet)
-                    projet_copy["marge_data"] = self._default_marge_data()
-                    projets_with_margins.append(projet_copy)
+                projet_copy = dict(projet)
+                projet_copy["marge_data"] = self._ensure_valid_marge(marges.get(projet["id"]))
+                projets_with_margins.append(projet_copy)
             
             data["projets"] = projets_with_margins
             
@@ -401,7 +434,7 @@ class DashboardController(http.Controller):
                 return request.make_response(f"Format '{format}' non supporté", status=400)
                 
         except Exception as e:
-            _logger.error(f"Erreur export dashboard: {str(e)}")
+            _logger.error("Erreur export dashboard: %s", e)
             return request.make_response(f"Erreur export: {str(e)}", status=500)
 
     def _make_xlsx_response(self, data, date_debut, date_fin):
@@ -531,7 +564,7 @@ class DashboardController(http.Controller):
             )
             
         except Exception as e:
-            _logger.error(f"Erreur génération Excel: {str(e)}")
+            _logger.error("Erreur génération Excel: %s", e)
             return request.make_response(f"Erreur génération Excel: {str(e)}", status=500)
 
     def _make_pdf_response(self, data, date_debut, date_fin):
@@ -658,7 +691,7 @@ class DashboardController(http.Controller):
             )
             
         except Exception as e:
-            _logger.error(f"Erreur génération PDF: {str(e)}")
+            _logger.error("Erreur génération PDF: %s", e)
             return request.make_response(f"Erreur génération PDF: {str(e)}", status=500)
 
     def _make_json_response(self, data, date_debut, date_fin):
@@ -680,7 +713,7 @@ class DashboardController(http.Controller):
                 ]
             )
         except Exception as e:
-            _logger.error(f"Erreur génération JSON: {str(e)}")
+            _logger.error("Erreur génération JSON: %s", e)
             return request.make_response(f"Erreur génération JSON: {str(e)}", status=500)
 
     def _make_csv_response(self, data, date_debut, date_fin):
@@ -727,7 +760,7 @@ class DashboardController(http.Controller):
             )
             
         except Exception as e:
-            _logger.error(f"Erreur génération CSV: {str(e)}")
+            _logger.error("Erreur génération CSV: %s", e)
             return request.make_response(f"Erreur génération CSV: {str(e)}", status=500)
 
     # ===== AUTRES ENDPOINTS (inchangés) =====
@@ -818,7 +851,7 @@ class DashboardController(http.Controller):
             datetime.strptime(date_str, '%Y-%m-%d')
             return date_str
         except ValueError:
-            _logger.warning(f"Format de date invalide: {date_str}")
+            _logger.warning("Format de date invalide: %s", date_str)
             return None
     
     def _error_response(self, message, include_default=False, default_marge=False):
@@ -882,7 +915,7 @@ class DashboardController(http.Controller):
             return result
             
         except Exception as e:
-            _logger.error(f"Erreur récupération données graphiques: {str(e)}")
+            _logger.error("Erreur récupération données graphiques: %s", e)
             return {
                 'graphique_ca': {'labels': [], 'data': [], 'backgroundColors': []},
                 'graphique_statuts': {'labels': [], 'data': [], 'backgroundColors': []},
@@ -897,14 +930,9 @@ class DashboardController(http.Controller):
         
         data['chiffre_affaires'] = float(data.get('chiffre_affaires', 0) or 0)
         
+        # Les projets sont déjà typés (float/int) par le modèle : pas de re-parcours ligne à ligne
         if not isinstance(data.get('projets'), list):
             data['projets'] = []
-        else:
-            for projet in data['projets']:
-                if isinstance(projet, dict):
-                    projet['ca'] = float(projet.get('ca', 0) or 0)
-                    projet['nb_personnes'] = int(projet.get('nb_personnes', 0) or 0)
-                    projet['heures'] = float(projet.get('heures', 0) or 0)
         
         marge_admin = data.get('marge_administrative', {})
         if not isinstance(marge_admin, dict):
@@ -974,7 +1002,7 @@ class DashboardController(http.Controller):
     def export_graphiques_pdf(self, date_debut=None, date_fin=None, graphiques_data=None, **kwargs):
         """Endpoint pour l'export des graphiques en PDF via le backend"""
         try:
-            _logger.info(f"Export graphiques PDF demandé - dates: {date_debut} - {date_fin}")
+            _logger.info("Export graphiques PDF demandé - dates: %s - %s", date_debut, date_fin)
             
             if not request.env.user:
                 return request.make_response("Utilisateur non authentifié", status=401)
@@ -1005,7 +1033,7 @@ class DashboardController(http.Controller):
             )
             
         except Exception as e:
-            _logger.error(f"Erreur export graphiques PDF: {str(e)}")
+            _logger.error("Erreur export graphiques PDF: %s", e)
             return request.make_response(f"Erreur export: {str(e)}", status=500)
 
     def _generate_graphiques_pdf_backend(self, graphique_data, date_debut, date_fin):
@@ -1189,5 +1217,5 @@ class DashboardController(http.Controller):
             return buffer
             
         except Exception as e:
-            _logger.error(f"Erreur génération PDF graphiques: {str(e)}")
+            _logger.error("Erreur génération PDF graphiques: %s", e)
             raise e
\ No newline at end of file
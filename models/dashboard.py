@@ -1,11 +1,44 @@
 # models/dashboard.py - VERSION OPTIMISÉE
 from odoo import models, fields, api
+import copy
+import functools
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
+from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Cache mémoire des résultats du dashboard, propre à chaque processus :
+# {clé: (horodatage, résultat)}. Voir DashboardProjet._get_resultat_en_cache
+_CACHE_RESULTATS = {}
+CACHE_TTL_DEFAUT = 60
+
+LAST_UPDATE_STATUS_LABELS = {
+    'on_track': 'En bonne voie',
+    'at_risk': 'En danger',
+    'off_track': 'En retard',
+    'on_hold': 'En attente',
+    'done': 'Fait',
+    'to_define': 'À définir',
+}
+
+MOIS_FR = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Juin',
+           'Juil', 'Août', 'Sep', 'Oct', 'Nov', 'Déc']
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date_str(date_str):
+    """Conversion mémorisée d'une chaîne en date (les dates sont immuables)"""
+    return fields.Date.from_string(date_str)
+
+
 class DashboardProjet(models.Model):
     _name = 'dashboard.projet'
     _description = 'Tableau de Bord Projet'
@@ -14,194 +47,204 @@ class DashboardProjet(models.Model):
     date_debut = fields.Date('Date de début', default=fields.Date.today)
     date_fin = fields.Date('Date de fin', default=lambda self: fields.Date.today() + timedelta(days=30))
     
+    def init(self):
+        """Crée les index utilisés par les requêtes du dashboard"""
+        # Index partiels ciblant les filtres des requêtes du dashboard
+        create_index(
+            self.env.cr, 'dashboard_projet_am_facture_date_idx', 'account_move',
+            ['company_id', 'invoice_date', 'amount_total_signed'],
+            where="state = 'posted' AND move_type = 'out_invoice'",
+        )
+        create_index(
+            self.env.cr, 'dashboard_projet_aml_compte_date_idx', 'account_move_line',
+            ['account_id', 'date'],
+            where="parent_state = 'posted'",
+        )
+        create_index(
+            self.env.cr, 'dashboard_projet_aal_projet_date_idx', 'account_analytic_line',
+            ['project_id', 'date'],
+        )
+
     @api.model
     def get_chiffre_affaires(self, date_debut=None, date_fin=None):
         """Calcul du chiffre d'affaires sur la période via les factures validées"""
         try:
-            total_ca = 0
-            
-            # Méthode recommandée: Via les factures validées
-            if self._model_exists('account.move'):
-                domain = [
-                    ('state', '=', 'posted'),
-                    ('move_type', '=', 'out_invoice')
-                ]
-                
-                if date_debut:
-                    date_debut = self._parse_date(date_debut)
-                    if date_debut:
-                        domain.append(('invoice_date', '>=', date_debut))
-                
-                if date_fin:
-                    date_fin = self._parse_date(date_fin)
-                    if date_fin:
-                        domain.append(('invoice_date', '<=', date_fin))
-                
-                factures = self.env['account.move'].search(domain)
-                ca_factures = sum(facture.amount_total_signed for facture in factures 
-                                if facture.amount_total_signed and facture.amount_total_signed > 0)
-                total_ca = max(total_ca, ca_factures)
-            
-            _logger.info(f"CA calculé: {total_ca} pour la période {date_debut} à {date_fin}")
-            return total_ca
-            
+            return self._calcul_chiffre_affaires(date_debut, date_fin)
         except Exception as e:
-            _logger.error(f"Erreur dans get_chiffre_affaires: {str(e)}")
+            _logger.error("Erreur dans get_chiffre_affaires: %s", e)
             return 0
 
-    @api.model
-    def get_projets_data(self, date_debut=None, date_fin=None):
-        """Récupération des données des projets avec calculs optimisés"""
-        try:
-            if not self._model_exists('project.project'):
-                _logger.warning("Modèle project.project non disponible")
-                return []
-            
-            # Recherche des projets actifs
-            domain = []
-            if self._field_exists('project.project', 'active'):
-                domain.append(('active', '=', True))
-            
-            # Filtrage par date si possible
+    def _calcul_chiffre_affaires(self, date_debut=None, date_fin=None):
+        """Calcul du chiffre d'affaires via les factures validées"""
+        total_ca = 0
+        
+        # Méthode recommandée: Via les factures validées
+        if self._model_exists('account.move'):
             date_debut = self._parse_date(date_debut)
             date_fin = self._parse_date(date_fin)
             
-            if date_debut and self._field_exists('project.project', 'date_start'):
-                domain.append(('date_start', '>=', date_debut))
-            if date_fin and self._field_exists('project.project', 'date'):
-                domain.append(('date', '<=', date_fin))
-            
-            projets = self.env['project.project'].search(domain, limit=500)
-            _logger.info(f"Trouvé {len(projets)} projets")
-            
-            projets_data = []
-            
-            for projet in projets:
-                try:
-                    projet_info = {
-                        'id': projet.id,
-                        'name': projet.name or f'Projet {projet.id}',
-                        'ca': self._get_ca_projet_optimized(projet, date_debut, date_fin),
-                        'nb_personnes': self._get_nb_personnes_projet(projet),
-                        'heures': self._get_heures_projet(projet, date_debut, date_fin),
-                        'stage': self._get_stage_projet(projet),
-                        'marge_data': None
-                    }
-                    
-                    projets_data.append(projet_info)
-                    
-                except Exception as e:
-                    _logger.error(f"Erreur traitement projet {projet.id}: {str(e)}")
-                    projets_data.append({
-                        'id': projet.id,
-                        'name': projet.name or f'Projet {projet.id}',
-                        'ca': 0,
-                        'nb_personnes': 0,
-                        'heures': 0,
-                        'stage': 'Erreur',
-                        'marge_data': None
-                    })
-            
-            return projets_data
+            domain = [
+                ('state', '=', 'posted'),
+                ('move_type', '=', 'out_invoice'),
+                ('amount_total_signed', '>', 0),
+            ]
+            if date_debut:
+                domain.append(('invoice_date', '>=', date_debut))
+            if date_fin:
+                domain.append(('invoice_date', '<=', date_fin))
             
-        except Exception as e:
-            _logger.error(f"Erreur critique dans get_projets_data: {str(e)}")
-            return []
+            # Somme calculée par PostgreSQL sans charger les factures ; read_group
+            # applique les droits et règles d'accès de l'utilisateur
+            groupes = self.env['account.move'].read_group(domain, ['amount_total_signed:sum'], [])
+            total_ca = float(groupes[0]['amount_total_signed'] or 0) if groupes else 0.0
+        
+        _logger.info("CA calculé: %s pour la période %s à %s", total_ca, date_debut, date_fin)
+        return total_ca
 
-    def _get_ca_projet_optimized(self, projet, date_debut=None, date_fin=None):
-        """Calcul optimisé du CA d'un projet via les factures analytiques"""
+    @api.model
+    def get_projets_data(self, date_debut=None, date_fin=None):
+        """Récupération des données des projets (mises en cache quelques secondes)"""
         try:
-            ca = 0
-            
-            # Méthode recommandée: Via les lignes de facture avec distribution analytique
-            if (self._model_exists('account.move.line') and 
-                hasattr(projet, 'analytic_account_id') and 
-                projet.analytic_account_id):
-                
-                domain = [
-                    ('move_id.state', '=', 'posted'),
-                    ('move_id.move_type', '=', 'out_invoice'),
-                    ('analytic_distribution', '!=', False)
-                ]
-                
-                # Recherche par distribution analytique (Odoo 16+)
-                analytic_lines = self.env['account.move.line'].search(domain)
-                
-                if date_debut:
-                    analytic_lines = analytic_lines.filtered(lambda l: l.move_id.invoice_date >= date_debut)
-                if date_fin:
-                    analytic_lines = analytic_lines.filtered(lambda l: l.move_id.invoice_date <= date_fin)
-                
-                for ligne in analytic_lines:
-                    if ligne.analytic_distribution:
-                        # Vérifier si le compte analytique est dans la distribution
-                        if str(projet.analytic_account_id.id) in str(ligne.analytic_distribution):
-                            ca += ligne.price_subtotal or 0
-            
-            _logger.debug(f"CA calculé pour projet {projet.id}: {ca}")
-            return ca
-            
+            return self._get_resultat_en_cache(
+                'projets', date_debut, date_fin,
+                lambda: self._calcul_projets_data(date_debut, date_fin),
+            )
         except Exception as e:
-            _logger.warning(f"Erreur calcul CA projet {projet.id}: {str(e)}")
-            return 0
+            _logger.error("Erreur critique dans get_projets_data: %s", e)
+            return []
 
-    def _get_nb_personnes_projet(self, projet):
-        """Calcul du nombre de personnes via les timesheets"""
-        try:
-            # Méthode recommandée: Via les timesheets (personnes ayant travaillé)
-            if self._model_exists('account.analytic.line'):
-                timesheets = self.env['account.analytic.line'].search([
-                    ('project_id', '=', projet.id),
-                    ('employee_id', '!=', False)
-                ])
-                return len(set(timesheets.mapped('employee_id.id')))
-            
-            return 0
-            
-        except Exception as e:
-            _logger.warning(f"Erreur comptage personnel projet {projet.id}: {str(e)}")
-            return 0
+    def _calcul_projets_data(self, date_debut=None, date_fin=None):
+        """Récupération des données des projets avec calculs optimisés"""
+        if not self._model_exists('project.project'):
+            _logger.warning("Modèle project.project non disponible")
+            return []
+        
+        # Recherche des projets actifs
+        domain = []
+        if self._field_exists('project.project', 'active'):
+            domain.append(('active', '=', True))
+        
+        # Filtrage par date si possible
+        date_debut = self._parse_date(date_debut)
+        date_fin = self._parse_date(date_fin)
+        
+        if date_debut and self._field_exists('project.project', 'date_start'):
+            domain.append(('date_start', '>=', date_debut))
+        if date_fin and self._field_exists('project.project', 'date'):
+            domain.append(('date', '<=', date_fin))
+        
+        # Lecture en une requête des seuls champs utiles, sans instancier de records
+        avec_analytique = self._field_exists('project.project', 'analytic_account_id')
+        avec_statut = self._field_exists('project.project', 'last_update_status')
+        champs = ['name'] + (['analytic_account_id'] if avec_analytique else []) + (['last_update_status'] if avec_statut else [])
+        projets = self.env['project.project'].search_read(domain, champs, limit=500)
+        _logger.info("Trouvé %s projets", len(projets))
+        projet_ids = [projet['id'] for projet in projets]
+        
+        # CA de tous les projets en une seule requête, puis simple lecture par compte
+        ca_par_compte = {}
+        if avec_analytique:
+            ca_par_compte = self._get_ca_comptes_analytiques(
+                [projet['analytic_account_id'][0] for projet in projets if projet['analytic_account_id']],
+                date_debut, date_fin,
+            )
+        
+        # Personnes et heures de tous les projets en deux requêtes groupées
+        nb_personnes_par_projet = self._get_nb_personnes_projets(projet_ids)
+        heures_par_projet = self._get_heures_projets(projet_ids, date_debut, date_fin)
+        
+        # Assemblage pur à partir des dictionnaires pré-calculés : aucune requête par projet
+        projets_data = [
+            {
+                'id': projet['id'],
+                'name': projet['name'] or f"Projet {projet['id']}",
+                'ca': ca_par_compte.get(projet['analytic_account_id'][0], 0.0)
+                      if avec_analytique and projet['analytic_account_id'] else 0.0,
+                'nb_personnes': int(nb_personnes_par_projet.get(projet['id'], 0)),
+                'heures': float(heures_par_projet.get(projet['id'], 0.0)),
+                'stage': LAST_UPDATE_STATUS_LABELS.get(projet['last_update_status'], str(projet['last_update_status']))
+                         if avec_statut else 'Actif',
+                'marge_data': None
+            }
+            for projet in projets
+        ]
+        
+        return projets_data
 
-    def _get_heures_projet(self, projet, date_debut=None, date_fin=None):
-        """Calcul des heures travaillées sur le projet via timesheets"""
-        try:
-            if not self._model_exists('account.analytic.line'):
-                return 0
-            
-            domain = [('project_id', '=', projet.id)]
-            
-            if date_debut:
-                domain.append(('date', '>=', date_debut))
-            if date_fin:
-                domain.append(('date', '<=', date_fin))
-            
-            timesheets = self.env['account.analytic.line'].search(domain)
-            return sum(ts.unit_amount for ts in timesheets if ts.unit_amount)
-            
-        except Exception as e:
-            _logger.warning(f"Erreur calcul heures projet {projet.id}: {str(e)}")
-            return 0
+    def _get_ca_comptes_analytiques(self, analytic_ids, date_debut=None, date_fin=None):
+        """Calcul groupé du CA par compte analytique en une seule requête"""
+        if not analytic_ids or not self._model_exists('account.move.line'):
+            return {}
 
-    def _get_stage_projet(self, projet):
-        """Récupération du statut/étape du projet"""
-        try:
-            # Méthode recommandée: Via last_update_status
-            if hasattr(projet, 'last_update_status'):
-                last_update_status_mapping = {
-                    'on_track': 'En bonne voie',
-                    'at_risk': 'En danger', 
-                    'off_track': 'En retard',
-                    'on_hold': 'En attente',
-                    'done': 'Fait',
-                    'to_define': 'À définir'
-                }
-                return last_update_status_mapping.get(projet.last_update_status, str(projet.last_update_status))
+        AccountMoveLine = self.env['account.move.line']
+        # Sans accès aux lignes de factures, CA à 0 : les projets restent affichés
+        if not AccountMoveLine.check_access_rights('read', raise_exception=False):
+            return {}
+        AccountMoveLine.flush_model(['move_id', 'parent_state', 'company_id', 'analytic_distribution', 'price_subtotal'])
+        self.env['account.move'].flush_model(['move_type', 'invoice_date'])
 
-            return 'Actif'
-            
-        except Exception as e:
-            _logger.warning(f"Erreur récupération statut projet {projet.id}: {str(e)}")
-            return 'Bizarre'
+        # Lignes de factures visibles par l'utilisateur : les règles d'accès
+        # (multi-société, factures personnelles des commerciaux...) s'appliquent
+        domain = [('parent_state', '=', 'posted'), ('move_id.move_type', '=', 'out_invoice')]
+        if date_debut:
+            domain.append(('move_id.invoice_date', '>=', date_debut))
+        if date_fin:
+            domain.append(('move_id.invoice_date', '<=', date_fin))
+        lignes = AccountMoveLine._search(domain)
+
+        # Même expression que l'index GIN posé par le module analytic sur les
+        # clés de analytic_distribution : seules les lignes concernées sont lues
+        self.env.cr.execute(SQL("""
+            SELECT compte.id::integer, SUM(aml.price_subtotal * dist.pourcentage::numeric / 100)
+              FROM account_move_line aml
+             CROSS JOIN LATERAL jsonb_each_text(aml.analytic_distribution) AS dist(cle, pourcentage)
+             CROSS JOIN LATERAL unnest(string_to_array(dist.cle, ',')) AS compte(id)
+             WHERE aml.id IN (%s)
+               AND regexp_split_to_array(
+                       jsonb_path_query_array(aml.analytic_distribution, '$.keyvalue()."key"')::text, '\\D+'
+                   ) && %s
+             GROUP BY compte.id
+        """, lignes.select(), [str(compte_id) for compte_id in analytic_ids]))
+        analytic_ids = set(analytic_ids)
+        return {
+            compte_id: float(ca or 0)
+            for compte_id, ca in self.env.cr.fetchall()
+            if compte_id in analytic_ids
+        }
+
+    def _get_nb_personnes_projets(self, projet_ids):
+        """Nombre d'employés distincts ayant saisi des timesheets, par projet"""
+        if not projet_ids or not self._model_exists('account.analytic.line'):
+            return {}
+        
+        groupes = self.env['account.analytic.line'].read_group(
+            [('project_id', 'in', list(projet_ids)), ('employee_id', '!=', False)],
+            ['employee_id:count_distinct'],
+            ['project_id'],
+        )
+        return {
+            groupe['project_id'][0]: groupe['employee_id'] or 0
+            for groupe in groupes
+            if groupe['project_id']
+        }
+
+    def _get_heures_projets(self, projet_ids, date_debut=None, date_fin=None):
+        """Somme des heures des timesheets sur la période, par projet"""
+        if not projet_ids or not self._model_exists('account.analytic.line'):
+            return {}
+        
+        domain = [('project_id', 'in', list(projet_ids))]
+        if date_debut:
+            domain.append(('date', '>=', date_debut))
+        if date_fin:
+            domain.append(('date', '<=', date_fin))
+        
+        groupes = self.env['account.analytic.line'].read_group(domain, ['unit_amount:sum'], ['project_id'])
+        return {
+            groupe['project_id'][0]: groupe['unit_amount'] or 0.0
+            for groupe in groupes
+            if groupe['project_id']
+        }
 
     @api.model
     def get_marge_salariale_projet(self, projet_id, date_debut=None, date_fin=None):
@@ -212,97 +255,81 @@ class DashboardProjet(models.Model):
             
             projet = self.env['project.project'].browse(projet_id)
             if not projet.exists():
-                _logger.warning(f"Projet {projet_id} non trouvé")
+                _logger.warning("Projet %s non trouvé", projet_id)
                 return self._get_empty_marge()
             
             date_debut = self._parse_date(date_debut)
             date_fin = self._parse_date(date_fin)
             
-            # Calcul des revenus
-            revenus = self._get_ca_projet_optimized(projet, date_debut, date_fin)
+            # Revenus et coûts salariaux via le calcul groupé, mis en cache quelques secondes
+            result = self._get_resultat_en_cache(
+                ('marge', projet.id), date_debut, date_fin,
+                lambda: self.get_marges_projets(projet.ids, date_debut, date_fin).get(projet.id, self._get_empty_marge()),
+            )
             
-            # Calcul des coûts salariaux
-            cout_salarial = self._get_cout_salarial_projet(projet, date_debut, date_fin)
+            _logger.info("Marge calculée pour projet %s (%s): %s", projet_id, projet.name, result)
+            return result
             
-            # Calcul de la marge
+        except Exception as e:
+            _logger.error("Erreur calcul marge projet %s: %s", projet_id, e)
+            return self._get_empty_marge()
+
+    @api.model
+    def get_marges_projets(self, projet_ids, date_debut=None, date_fin=None):
+        """Calcul groupé des marges salariales de plusieurs projets"""
+        if not projet_ids or not self._model_exists('project.project'):
+            return {}
+        
+        projets = self.env['project.project'].browse(projet_ids).exists()
+        date_debut = self._parse_date(date_debut)
+        date_fin = self._parse_date(date_fin)
+        
+        ca_par_compte = {}
+        avec_analytique = self._field_exists('project.project', 'analytic_account_id')
+        if avec_analytique:
+            ca_par_compte = self._get_ca_comptes_analytiques(
+                projets.analytic_account_id.ids, date_debut, date_fin)
+        couts = self._get_couts_salariaux(projets.ids, date_debut, date_fin)
+        
+        marges = {}
+        for projet in projets:
+            revenus = ca_par_compte.get(projet.analytic_account_id.id, 0.0) if avec_analytique else 0.0
+            cout_salarial = couts.get(projet.id, 0.0)
             marge = revenus - cout_salarial
             taux_marge = (marge / revenus * 100) if revenus > 0 else 0
-            
-            result = {
+            marges[projet.id] = {
                 'revenus': float(revenus),
                 'cout_salarial': float(cout_salarial),
                 'marge': float(marge),
                 'taux_marge': round(float(taux_marge), 2)
             }
-            
-            _logger.info(f"Marge calculée pour projet {projet_id} ({projet.name}): {result}")
-            return result
-            
-        except Exception as e:
-            _logger.error(f"Erreur calcul marge projet {projet_id}: {str(e)}")
-            return self._get_empty_marge()
+        return marges
 
-    def _get_cout_salarial_projet(self, projet, date_debut=None, date_fin=None):
-        """Calcul des coûts salariaux d'un projet via les timesheets"""
-        try:
-            if not self._model_exists('account.analytic.line'):
-                return 0
-            
-            domain = [('project_id', '=', projet.id)]
-            
-            if date_debut:
-                domain.append(('date', '>=', date_debut))
-            if date_fin:
-                domain.append(('date', '<=', date_fin))
-            
-            timesheets = self.env['account.analytic.line'].search(domain)
-            cout_total = 0
-            
-            _logger.debug(f"Analyse {len(timesheets)} timesheets pour projet {projet.id}")
-            
-            for ts in timesheets:
-                cout_ligne = 0
-                
-                # Méthode recommandée: Utiliser le montant négatif des timesheets (coûts)
-                if hasattr(ts, 'amount') and ts.amount is not None and ts.amount < 0:
-                    cout_ligne = abs(ts.amount)
-                    _logger.debug(f"Coût direct timesheet {ts.id}: {cout_ligne}")
-                
-                cout_total += cout_ligne
-            
-            _logger.info(f"Coût salarial total pour projet {projet.id}: {cout_total}")
-            return cout_total
-            
-        except Exception as e:
-            _logger.error(f"Erreur calcul coût salarial projet {projet.id}: {str(e)}")
-            return 0
+    def _get_couts_salariaux(self, projet_ids, date_debut=None, date_fin=None):
+        """Calcul groupé des coûts salariaux par projet"""
+        if not projet_ids or not self._model_exists('account.analytic.line'):
+            return {}
+        
+        domain = [('project_id', 'in', list(projet_ids)), ('amount', '<', 0)]
+        if date_debut:
+            domain.append(('date', '>=', date_debut))
+        if date_fin:
+            domain.append(('date', '<=', date_fin))
+        
+        groupes = self.env['account.analytic.line'].read_group(domain, ['amount:sum'], ['project_id'])
+        return {
+            groupe['project_id'][0]: abs(groupe['amount'] or 0.0)
+            for groupe in groupes
+            if groupe['project_id']
+        }
 
     @api.model
     def get_marge_administrative(self, date_debut=None, date_fin=None):
         """Calcul de la marge administrative globale"""
         try:
-            # CA total
-            ca_total = self.get_chiffre_affaires(date_debut, date_fin)
-            
-            # Coûts administratifs
-            cout_admin = self._get_cout_administratif(date_debut, date_fin)
-            
-            # Calcul de la marge
-            marge_admin = ca_total - cout_admin
-            taux_marge_admin = (marge_admin / ca_total * 100) if ca_total > 0 else 0
-            
-            result = {
-                'ca_total': float(ca_total),
-                'cout_admin': float(cout_admin),
-                'marge_admin': float(marge_admin),
-                'taux_marge_admin': round(float(taux_marge_admin), 2)
-            }
-            
-            _logger.info(f"Marge administrative calculée: {result}")
-            return result
-            
+            return self._calcul_marge_administrative(date_debut, date_fin)
         except Exception as e:
-            _logger.error(f"Erreur calcul marge administrative: {str(e)}")
+            _logger.error("Erreur calcul marge administrative: %s", e)
             return {
                 'ca_total': 0.0,
                 'cout_admin': 0.0,
@@ -310,73 +337,162 @@ class DashboardProjet(models.Model):
                 'taux_marge_admin': 0.0
             }
 
+    def _calcul_marge_administrative(self, date_debut=None, date_fin=None):
+        """Calcul de la marge administrative globale"""
+        date_debut = self._parse_date(date_debut)
+        date_fin = self._parse_date(date_fin)
+        
+        # CA total
+        ca_total = self._calcul_chiffre_affaires(date_debut, date_fin)
+        
+        # Coûts administratifs
+        cout_admin = self._get_cout_administratif(date_debut, date_fin)
+        
+        # Calcul de la marge
+        marge_admin = ca_total - cout_admin
+        taux_marge_admin = (marge_admin / ca_total * 100) if ca_total > 0 else 0
+        
+        result = {
+            'ca_total': float(ca_total),
+            'cout_admin': float(cout_admin),
+            'marge_admin': float(marge_admin),
+            'taux_marge_admin': round(float(taux_marge_admin), 2)
+        }
+        
+        _logger.info("Marge administrative calculée: %s", result)
+        return result
+
     def _get_cout_administratif(self, date_debut=None, date_fin=None):
         """Calcul des coûts administratifs via les comptes comptables"""
-        try:
-            cout_admin = 0
-            date_debut = self._parse_date(date_debut)
-            date_fin = self._parse_date(date_fin)
-            
-            # Méthode recommandée: Via les comptes comptables de frais généraux
-            if self._model_exists('account.move.line') and self._model_exists('account.account'):
-                # Recherche des comptes de charges administratives
-                comptes_admin = self.env['account.account'].search([
-                    '|', '|', '|', '|',
-                    ('code', 'like', '6%'),  # Comptes de charges
-                    ('name', 'ilike', 'admin'),
-                    ('name', 'ilike', 'frais généraux'),
-                    ('name', 'ilike', 'direction'),
-                    ('name', 'ilike', 'management')
-                ])
-                
-                if comptes_admin:
-                    domain_charges = [
-                        ('account_id', 'in', comptes_admin.ids),
-                        ('move_id.state', '=', 'posted')
-                    ]
-                    
-                    if date_debut:
-                        domain_charges.append(('date', '>=', date_debut))
-                    if date_fin:
-                        domain_charges.append(('date', '<=', date_fin))
-                    
-                    lignes_charges = self.env['account.move.line'].search(domain_charges)
-                    cout_admin = sum(abs(ligne.debit - ligne.credit) for ligne in lignes_charges)
+        cout_admin = 0
+        
+        # Méthode recommandée: Via les comptes comptables de frais généraux
+        if self._model_exists('account.move.line') and self._model_exists('account.account'):
+            comptes_admin_ids = self._get_comptes_admin_ids()
+            if not comptes_admin_ids:
+                return 0
             
-            return cout_admin
+            AccountMoveLine = self.env['account.move.line']
+            # Sans accès aux écritures, coûts à 0 comme avant la séparation du calcul
+            if not AccountMoveLine.check_access_rights('read', raise_exception=False):
+                return 0
+            AccountMoveLine.flush_model(['account_id', 'parent_state', 'date', 'debit', 'credit', 'company_id'])
             
-        except Exception as e:
-            _logger.warning(f"Erreur calcul coût administratif: {str(e)}")
-            return 0
+            # Lignes visibles par l'utilisateur : les règles d'accès s'appliquent
+            domain_charges = [
+                ('account_id', 'in', comptes_admin_ids),
+                ('parent_state', '=', 'posted')
+            ]
+            if date_debut:
+                domain_charges.append(('date', '>=', date_debut))
+            if date_fin:
+                domain_charges.append(('date', '<=', date_fin))
+            lignes_charges = AccountMoveLine._search(domain_charges)
+            
+            # Somme des montants absolus ligne à ligne calculée par PostgreSQL
+            self.env.cr.execute(SQL("""
+                SELECT COALESCE(SUM(ABS(debit - credit)), 0)
+                  FROM account_move_line
+                 WHERE id IN (%s)
+            """, lignes_charges.select()))
+            cout_admin = float(self.env.cr.fetchone()[0])
+        
+        return cout_admin
+
+    def _get_comptes_admin_ids(self):
+        """Ids des comptes de charges administratives (mis en cache quelques secondes)"""
+        return self._get_resultat_en_cache(
+            'comptes_admin', None, None,
+            lambda: self.env['account.account'].search([
+                '|', '|', '|', '|',
+                ('code', 'like', '6%'),  # Comptes de charges
+                ('name', 'ilike', 'admin'),
+                ('name', 'ilike', 'frais généraux'),
+                ('name', 'ilike', 'direction'),
+                ('name', 'ilike', 'management')
+            ]).ids,
+        )
 
     # Méthodes utilitaires
     def _model_exists(self, model_name):
         """Vérifie si un modèle existe"""
-        try:
-            return model_name in self.env
-        except:
-            return False
+        return model_name in self.env
 
     def _field_exists(self, model_name, field_name):
         """Vérifie si un champ existe dans un modèle"""
-        try:
-            return (self._model_exists(model_name) and 
-                    field_name in self.env[model_name]._fields)
-        except:
-            return False
+        return (self._model_exists(model_name) and 
+                field_name in self.env[model_name]._fields)
 
     def _parse_date(self, date_input):
         """Parse une date depuis string ou objet date"""
         if not date_input:
             return None
         
-        try:
-            if isinstance(date_input, str):
-                return fields.Date.from_string(date_input)
+        if not isinstance(date_input, str):
             return date_input
-        except:
+        try:
+            return _parse_date_str(date_input)
+        except (TypeError, ValueError):
             return None
 
+    def _get_empty_graphique_data(self):
+        """Retourne une structure de graphiques vide"""
+        return {
+            'graphique_ca': {'labels': [], 'data': [], 'backgroundColors': []},
+            'graphique_statuts': {'labels': [], 'data': [], 'backgroundColors': []},
+            'graphique_evolution': {'labels': [], 'data': []}
+        }
+
+    def _get_resultat_en_cache(self, nom, date_debut, date_fin, calcul, erreurs=None):
+        """Retourne le résultat de ``calcul()`` depuis le cache mémoire du processus"""
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param('dashboard_projet.cache_ttl', CACHE_TTL_DEFAUT))
+        if ttl <= 0:
+            return calcul()
+        
+        cle = (
+            self.env.cr.dbname, nom, self.env.uid, tuple(self.env.companies.ids), self.env.lang,
+            str(date_debut or ''), str(date_fin or ''),
+        )
+        maintenant = time.monotonic()
+        entree = _CACHE_RESULTATS.get(cle)
+        if entree and maintenant - entree[0] < ttl:
+            return copy.deepcopy(entree[1])
+        
+        resultat = calcul()
+        if erreurs:
+            # Résultat dégradé par une section en erreur : recalculé au prochain appel
+            return resultat
+        # Purge des entrées expirées avant d'ajouter la nouvelle
+        for cle_expiree, (horodatage, _resultat) in list(_CACHE_RESULTATS.items()):
+            if maintenant - horodatage >= ttl:
+                _CACHE_RESULTATS.pop(cle_expiree, None)
+        _CACHE_RESULTATS[cle] = (maintenant, resultat)
+        return copy.deepcopy(resultat)
+
+    def _calcul_parallele_actif(self):
+        """Indique si le calcul parallèle des sections est activé"""
+        valeur = self.env['ir.config_parameter'].sudo().get_param('dashboard_projet.calcul_parallele', 'False')
+        return valeur.strip().lower() in ('1', 'true', 'yes')
+
+    def _calculer_sections_en_parallele(self, sections, date_debut, date_fin):
+        """Calcule des sections indépendantes du dashboard dans des threads"""
+        uid, context, su = self.env.uid, dict(self.env.context), self.env.su
+        
+        def calculer(nom_methode):
+            with self.pool.cursor() as cr:
+                env = api.Environment(cr, uid, context, su=su)
+                return getattr(env[self._name], nom_methode)(date_debut, date_fin)
+        
+        resultats = {}
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {cle: executor.submit(calculer, nom_methode) for cle, nom_methode in sections.items()}
+            for cle, future in futures.items():
+                try:
+                    resultats[cle] = future.result()
+                except Exception as e:
+                    _logger.error("Erreur section %s: %s", cle, e)
+        return resultats
+
     def _get_empty_marge(self):
         """Retourne une structure de marge vide"""
         return {
@@ -387,56 +503,12 @@ class DashboardProjet(models.Model):
         }
 
     @api.model
-    def get_budget_data(self, date_debut=None, date_fin=None):
+    def get_budget_data(self, date_debut=None, date_fin=None, projets_data=None):
         """Récupération des données budgétaires"""
         try:
-            budget_data = {
-                'total_budget': 0.0,
-                'budget_utilise': 0.0,
-                'budget_restant': 0.0,
-                'taux_utilisation': 0.0,
-                'projets_budget': []
-            }
-            
-            if not self._model_exists('project.project'):
-                return budget_data
-            
-            # Récupérer les projets avec budget
-            domain = [('budget', '>', 0)]
-            if date_debut and self._field_exists('project.project', 'date_start'):
-                domain.append(('date_start', '>=', date_debut))
-            if date_fin and self._field_exists('project.project', 'date'):
-                domain.append(('date', '<=', date_fin))
-            
-            projets = self.env['project.project'].search(domain)
-            
-            total_budget = sum(projet.budget for projet in projets if projet.budget)
-            total_ca = 0
-            
-            for projet in projets:
-                ca_projet = self._get_ca_projet_optimized(projet, date_debut, date_fin)
-                total_ca += ca_projet
-                
-                taux_utilisation = (ca_projet / projet.budget * 100) if projet.budget > 0 else 0
-                
-                budget_data['projets_budget'].append({
-                    'id': projet.id,
-                    'name': projet.name,
-                    'budget': projet.budget,
-                    'ca_realise': ca_projet,
-                    'taux_utilisation': taux_utilisation,
-                    'budget_restant': max(0, projet.budget - ca_projet)
-                })
-            
-            budget_data['total_budget'] = total_budget
-            budget_data['budget_utilise'] = total_ca
-            budget_data['budget_restant'] = max(0, total_budget - total_ca)
-            budget_data['taux_utilisation'] = (total_ca / total_budget * 100) if total_budget > 0 else 0
-            
-            return budget_data
-            
+            return self._calcul_budget_data(date_debut, date_fin, projets_data)
         except Exception as e:
-            _logger.error(f"Erreur récupération données budget: {str(e)}")
+            _logger.error("Erreur récupération données budget: %s", e)
             return {
                 'total_budget': 0.0,
                 'budget_utilise': 0.0,
@@ -445,123 +517,208 @@ class DashboardProjet(models.Model):
                 'projets_budget': []
             }
 
+    def _calcul_budget_data(self, date_debut=None, date_fin=None, projets_data=None):
+        """Récupération des données budgétaires"""
+        budget_data = {
+            'total_budget': 0.0,
+            'budget_utilise': 0.0,
+            'budget_restant': 0.0,
+            'taux_utilisation': 0.0,
+            'projets_budget': []
+        }
+        
+        if not self._model_exists('project.project'):
+            return budget_data
+        
+        # Récupérer les projets avec budget
+        domain = [('budget', '>', 0)]
+        if date_debut and self._field_exists('project.project', 'date_start'):
+            domain.append(('date_start', '>=', date_debut))
+        if date_fin and self._field_exists('project.project', 'date'):
+            domain.append(('date', '<=', date_fin))
+        
+        # Lecture en une requête des seuls champs utiles, sans instancier de records
+        avec_analytique = self._field_exists('project.project', 'analytic_account_id')
+        champs = ['name', 'budget'] + (['analytic_account_id'] if avec_analytique else [])
+        projets = self.env['project.project'].search_read(domain, champs)
+        
+        total_budget = 0
+        total_ca = 0
+        
+        # CA des autres projets en une seule requête groupée par compte analytique
+        ca_connu = {projet['id']: projet['ca'] for projet in projets_data or []}
+        ca_par_compte = {}
+        if avec_analytique:
+            ca_par_compte = self._get_ca_comptes_analytiques(
+                [
+                    projet['analytic_account_id'][0] for projet in projets
+                    if projet['analytic_account_id'] and projet['id'] not in ca_connu
+                ],
+                self._parse_date(date_debut),
+                self._parse_date(date_fin),
+            )
+        
+        for projet in projets:
+            budget = projet['budget']
+            compte = projet.get('analytic_account_id')
+            if projet['id'] in ca_connu:
+                ca_projet = ca_connu[projet['id']]
+            else:
+                ca_projet = ca_par_compte.get(compte[0], 0.0) if compte else 0.0
+            total_budget += budget
+            total_ca += ca_projet
+            
+            # budget > 0 est garanti par le domaine de recherche
+            taux_utilisation = ca_projet / budget * 100
+            
+            budget_data['projets_budget'].append({
+                'id': projet['id'],
+                'name': projet['name'],
+                'budget': budget,
+                'ca_realise': ca_projet,
+                'taux_utilisation': taux_utilisation,
+                'budget_restant': max(0, budget - ca_projet)
+            })
+        
+        budget_data['total_budget'] = total_budget
+        budget_data['budget_utilise'] = total_ca
+        budget_data['budget_restant'] = max(0, total_budget - total_ca)
+        budget_data['taux_utilisation'] = (total_ca / total_budget * 100) if total_budget > 0 else 0
+        
+        return budget_data
+
     @api.model
-    def get_graphique_data(self, date_debut=None, date_fin=None):
+    def get_graphique_data(self, date_debut=None, date_fin=None, projets_data=None):
+        """Prépare les données pour les graphiques (mises en cache quelques secondes)"""
+        return self._get_resultat_en_cache(
+            'graphiques', date_debut, date_fin,
+            lambda: self._calcul_graphique_data(date_debut, date_fin, projets_data),
+        )
+
+    def _calcul_graphique_data(self, date_debut=None, date_fin=None, projets_data=None):
         """Prépare les données pour les graphiques"""
-        try:
-            # Données pour graphique à barres (CA par projet)
-            projets_data = self.get_projets_data(date_debut, date_fin)
-            graphique_ca = {
-                'labels': [],
-                'data': [],
-                'backgroundColors': []
-            }
-            
-            # Couleurs pour le graphique
-            colors = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#6f42c1', 
-                    '#20c997', '#fd7e14', '#e83e8c', '#6c757d', '#17a2b8']
-            
-            for i, projet in enumerate(projets_data):
-                if projet['ca'] > 0:  # N'afficher que les projets avec CA
-                    graphique_ca['labels'].append(projet['name'][:20] + '...' if len(projet['name']) > 20 else projet['name'])
-                    graphique_ca['data'].append(projet['ca'])
-                    graphique_ca['backgroundColors'].append(colors[i % len(colors)])
-            
-            # Données pour graphique circulaire (Répartition statuts)
-            statuts = {}
-            for projet in projets_data:
-                statut = projet['stage']
-                statuts[statut] = statuts.get(statut, 0) + 1
-            
-            graphique_statuts = {
-                'labels': list(statuts.keys()),
-                'data': list(statuts.values()),
-                'backgroundColors': colors[:len(statuts)]
-            }
-            
-            # Données pour graphique linéaire (Évolution mensuelle du CA)
-            graphique_evolution = self._get_evolution_mensuelle_ca(date_debut, date_fin)
-            
-            return {
-                'graphique_ca': graphique_ca,
-                'graphique_statuts': graphique_statuts,
-                'graphique_evolution': graphique_evolution
-            }
-            
-        except Exception as e:
-            _logger.error(f"Erreur préparation données graphiques: {str(e)}")
-            return {
-                'graphique_ca': {'labels': [], 'data': [], 'backgroundColors': []},
-                'graphique_statuts': {'labels': [], 'data': [], 'backgroundColors': []},
-                'graphique_evolution': {'labels': [], 'data': []}
-            }
+        # Données pour graphique linéaire (Évolution mensuelle du CA), indépendantes des projets
+        graphique_evolution = self._get_evolution_mensuelle_ca(date_debut, date_fin)
+        
+        # Sans projet, les graphiques par projet et par statut sont vides
+        if projets_data is None:
+            projets_data = self._calcul_projets_data(date_debut, date_fin)
+        if not projets_data:
+            graphique_data = self._get_empty_graphique_data()
+            graphique_data['graphique_evolution'] = graphique_evolution
+            return graphique_data
+        
+        # Données pour graphique à barres (CA par projet)
+        graphique_ca = {
+            'labels': [],
+            'data': [],
+            'backgroundColors': []
+        }
+        
+        # Couleurs pour le graphique
+        colors = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#6f42c1', 
+                '#20c997', '#fd7e14', '#e83e8c', '#6c757d', '#17a2b8']
+        
+        # Un seul parcours des projets pour le CA par projet et la répartition des statuts
+        statuts = Counter()
+        champs_projet = itemgetter('name', 'ca', 'stage')
+        # Méthodes liées une fois pour toutes hors de la boucle
+        ajouter_label = graphique_ca['labels'].append
+        ajouter_ca = graphique_ca['data'].append
+        ajouter_couleur = graphique_ca['backgroundColors'].append
+        nb_couleurs = len(colors)
+        for i, (name, ca, stage) in enumerate(map(champs_projet, projets_data)):
+            if ca > 0:  # N'afficher que les projets avec CA
+                ajouter_label(name[:20] + '...' if len(name) > 20 else name)
+                ajouter_ca(ca)
+                ajouter_couleur(colors[i % nb_couleurs])
+            
+            statuts[stage] += 1
+        
+        # Données pour graphique circulaire (Répartition statuts)
+        graphique_statuts = {
+            'labels': list(statuts.keys()),
+            'data': list(statuts.values()),
+            'backgroundColors': colors[:len(statuts)]
+        }
+        
+        return {
+            'graphique_ca': graphique_ca,
+            'graphique_statuts': graphique_statuts,
+            'graphique_evolution': graphique_evolution
+        }
 
     def _get_evolution_mensuelle_ca(self, date_debut=None, date_fin=None):
         """Calcule l'évolution mensuelle du CA"""
-        try:
-            if not self._model_exists('account.move'):
-                return {'labels': [], 'data': []}
-            
-            # Déterminer la plage de dates
-            if not date_debut:
-                date_debut = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            if not date_fin:
-                date_fin = datetime.now().strftime('%Y-%m-%d')
-            
-            date_debut = self._parse_date(date_debut)
-            date_fin = self._parse_date(date_fin)
-            
-            # Générer tous les mois dans l'intervalle
-            current = date_debut.replace(day=1)
-            end = date_fin.replace(day=1)
-            months = []
-            
-            while current <= end:
-                months.append(current.strftime('%Y-%m'))
-                # Passer au mois suivant
-                if current.month == 12:
-                    current = current.replace(year=current.year + 1, month=1)
-                else:
-                    current = current.replace(month=current.month + 1)
-            
-            # Récupérer le CA pour chaque mois
-            ca_par_mois = []
-            for month in months:
-                start_date = datetime.strptime(month + '-01', '%Y-%m-%d')
-                if start_date.month == 12:
-                    end_date = start_date.replace(year=start_date.year + 1, month=1, day=1) - timedelta(days=1)
-                else:
-                    end_date = start_date.replace(month=start_date.month + 1, day=1) - timedelta(days=1)
-                
-                ca_mois = self.get_chiffre_affaires(
-                    start_date.strftime('%Y-%m-%d'),
-                    end_date.strftime('%Y-%m-%d')
-                )
-                ca_par_mois.append(ca_mois)
-            
-            # Formater les labels en français
-            mois_fr = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Juin', 
-                    'Juil', 'Août', 'Sep', 'Oct', 'Nov', 'Déc']
-            
-            labels = []
-            for month in months:
-                year, month_num = month.split('-')
-                labels.append(f"{mois_fr[int(month_num)-1]} {year}")
-            
-            return {
-                'labels': labels,
-                'data': ca_par_mois
-            }
-            
-        except Exception as e:
-            _logger.error(f"Erreur calcul évolution mensuelle CA: {str(e)}")
+        if not self._model_exists('account.move'):
             return {'labels': [], 'data': []}
+        if not self.env['account.move'].check_access_rights('read', raise_exception=False):
+            return {'labels': [], 'data': []}
+        
+        # Déterminer la plage de dates
+        if not date_debut:
+            date_debut = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        if not date_fin:
+            date_fin = datetime.now().strftime('%Y-%m-%d')
+        
+        date_debut = self._parse_date(date_debut)
+        date_fin = self._parse_date(date_fin)
+        
+        # Générer tous les mois dans l'intervalle (premier jour de chaque mois)
+        premier_mois = date_debut.replace(day=1)
+        nb_mois = (date_fin.year - premier_mois.year) * 12 + date_fin.month - premier_mois.month + 1
+        months = [premier_mois + relativedelta(months=i) for i in range(nb_mois)]
+        
+        ca_mensuel = {}
+        if months:
+            # Agrégat mensuel en une requête sur les seules factures visibles
+            AccountMove = self.env['account.move']
+            AccountMove.flush_model(['state', 'move_type', 'invoice_date', 'amount_total_signed', 'company_id'])
+            factures = AccountMove._search([
+                ('state', '=', 'posted'),
+                ('move_type', '=', 'out_invoice'),
+                ('amount_total_signed', '>', 0),
+                ('invoice_date', '>=', months[0]),
+                ('invoice_date', '<', months[-1] + relativedelta(months=1)),
+            ])
+            self.env.cr.execute(SQL("""
+                SELECT date_trunc('month', invoice_date)::date, SUM(amount_total_signed)
+                  FROM account_move
+                 WHERE id IN (%s)
+                 GROUP BY 1
+            """, factures.select()))
+            ca_mensuel = {mois: float(ca) for mois, ca in self.env.cr.fetchall()}
+        
+        # Label français et CA (0 pour les mois sans facture) de chaque mois
+        labels = []
+        ca_par_mois = []
+        for month in months:
+            labels.append(f"{MOIS_FR[month.month - 1]} {month.year}")
+            ca_par_mois.append(ca_mensuel.get(month, 0.0))
+        
+        return {
+            'labels': labels,
+            'data': ca_par_mois
+        }
 
     @api.model
     def get_dashboard_data(self, date_debut=None, date_fin=None):
         """Méthode principale pour récupérer toutes les données du dashboard"""
+        date_debut = self._parse_date(date_debut)
+        date_fin = self._parse_date(date_fin)
+        erreurs = []
+        return self._get_resultat_en_cache(
+            'dashboard', date_debut, date_fin,
+            lambda: self._calcul_dashboard_data(date_debut, date_fin, erreurs),
+            erreurs,
+        )
+
+    def _calcul_dashboard_data(self, date_debut=None, date_fin=None, erreurs=None):
+        """Calcul de toutes les sections du dashboard (sections en erreur ajoutées à ``erreurs``)"""
+        if erreurs is None:
+            erreurs = []
         try:
-            _logger.info(f"Récupération données dashboard: {date_debut} à {date_fin}")
+            _logger.info("Récupération données dashboard: %s à %s", date_debut, date_fin)
             
             result = {
                 'chiffre_affaires': 0.0,
@@ -579,43 +736,59 @@ class DashboardProjet(models.Model):
                     'taux_utilisation': 0.0,
                     'projets_budget': []
                 },
-                'graphique_data': {
-                    'graphique_ca': {'labels': [], 'data': [], 'backgroundColors': []},
-                    'graphique_statuts': {'labels': [], 'data': [], 'backgroundColors': []},
-                    'graphique_evolution': {'labels': [], 'data': []}
-                }
+                'graphique_data': self._get_empty_graphique_data()
             }
             
-            # Calcul séquentiel avec gestion d'erreur
-            try:
-                result['chiffre_affaires'] = float(self.get_chiffre_affaires(date_debut, date_fin))
-            except Exception as e:
-                _logger.error(f"Erreur CA: {str(e)}")
-            
-            try:
-                result['projets'] = self.get_projets_data(date_debut, date_fin)
-            except Exception as e:
-                _logger.error(f"Erreur projets: {str(e)}")
-            
-            try:
-                result['marge_administrative'] = self.get_marge_administrative(date_debut, date_fin)
-            except Exception as e:
-                _logger.error(f"Erreur marge admin: {str(e)}")
-            
-            try:
-                result['budget_data'] = self.get_budget_data(date_debut, date_fin)
-            except Exception as e:
-                _logger.error(f"Erreur données budget: {str(e)}")
+            if self._calcul_parallele_actif():
+                # Sections indépendantes calculées en parallèle, chacune avec son curseur
+                sections = {
+                    'chiffre_affaires': '_calcul_chiffre_affaires',
+                    'projets': '_calcul_projets_data',
+                    'marge_administrative': '_calcul_marge_administrative',
+                    'budget_data': '_calcul_budget_data',
+                }
+                resultats = self._calculer_sections_en_parallele(sections, date_debut, date_fin)
+                erreurs.extend(cle for cle in sections if cle not in resultats)
+                result.update(resultats)
+                result['chiffre_affaires'] = float(result['chiffre_affaires'])
+            else:
+                # Calcul séquentiel avec gestion d'erreur
+                try:
+                    result['chiffre_affaires'] = float(self._calcul_chiffre_affaires(date_debut, date_fin))
+                except Exception as e:
+                    erreurs.append('chiffre_affaires')
+                    _logger.error("Erreur CA: %s", e)
+                
+                try:
+                    result['projets'] = self._calcul_projets_data(date_debut, date_fin)
+                except Exception as e:
+                    erreurs.append('projets')
+                    _logger.error("Erreur projets: %s", e)
+                
+                try:
+                    result['marge_administrative'] = self._calcul_marge_administrative(date_debut, date_fin)
+                except Exception as e:
+                    erreurs.append('marge_administrative')
+                    _logger.error("Erreur marge admin: %s", e)
+                
+                try:
+                    result['budget_data'] = self._calcul_budget_data(date_debut, date_fin, result['projets'])
+                except Exception as e:
+                    erreurs.append('budget_data')
+                    _logger.error("Erreur données budget: %s", e)
             
+            # Les graphiques réutilisent la liste des projets calculée ci-dessus
             try:
-                result['graphique_data'] = self.get_graphique_data(date_debut, date_fin)
+                result['graphique_data'] = self._calcul_graphique_data(date_debut, date_fin, result['projets'])
             except Exception as e:
-                _logger.error(f"Erreur données graphiques: {str(e)}")
+                erreurs.append('graphique_data')
+                _logger.error("Erreur données graphiques: %s", e)
             
             return result
             
         except Exception as e:
-            _logger.error(f"Erreur critique dashboard: {str(e)}")
+            erreurs.append('dashboard')
+            _logger.error("Erreur critique dashboard: %s", e)
             return {
                 'chiffre_affaires': 0.0,
                 'projets': [],
@@ -632,9 +805,5 @@ class DashboardProjet(models.Model):
                     'taux_utilisation': 0.0,
                     'projets_budget': []
                 },
-                'graphique_data': {
-                    'graphique_ca': {'labels': [], 'data': [], 'backgroundColors': []},
-                    'graphique_statuts': {'labels': [], 'data': [], 'backgroundColors': []},
-                    'graphique_evolution': {'labels': [], 'data': []}
-                }
+                'graphique_data': self._get_empty_graphique_data()
             }
\ No newline at end of file